@@ -18,6 +18,7 @@ RAW_DIR = DATA_DIR / "raw"
 NORMALIZED_DIR = DATA_DIR / "normalized"
 INCIDENTS_DIR = DATA_DIR / "incidents"
 STATES_DIR = DATA_DIR / "states"
+DEDUP_MEMO_PATH = DATA_DIR / "dedup_memo.json"
 
 USER_AGENT = "Mozilla/5.0 (compatible; CodexDataBot/1.0)"
 
@@ -93,6 +94,15 @@ def write_json(path: Path, data: Any) -> None:
     path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
 
 
+def read_json(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
 def fetch_text(url: str, timeout: int = 30, allow_insecure: bool = False, headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], Dict[str, Any]]:
     req_headers = {"User-Agent": USER_AGENT}
     if headers:
@@ -347,53 +357,215 @@ def normalize_ojonc(records: List[Dict[str, Any]], fetched_at: str) -> List[Dict
     return normalized
 
 
-def deduplicate(incidents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    incidents = sorted(incidents, key=lambda x: x.get("reported_at", ""))
-    merged: List[Dict[str, Any]] = []
-    for inc in incidents:
-        matched_idx = None
-        for idx, existing in enumerate(merged):
-            try:
-                t1 = dt.datetime.fromisoformat(inc["reported_at"].replace("Z", "+00:00"))
-                t2 = dt.datetime.fromisoformat(existing["reported_at"].replace("Z", "+00:00"))
-            except Exception:
-                continue
-            if abs((t1 - t2).total_seconds()) > 2 * 3600:
-                continue
-            dist = haversine_km(
-                inc["location"]["lat"],
-                inc["location"]["lng"],
-                existing["location"]["lat"],
-                existing["location"]["lng"],
-            )
-            if dist > 1.0:
-                continue
-            sim = similarity(inc.get("description", ""), existing.get("description", ""))
-            if sim < 0.75:
+DEDUP_WINDOW_SECONDS = 2 * 3600
+DEDUP_RADIUS_KM = 1.0
+DEDUP_MIN_SIMILARITY = 0.75
+DEDUP_CONFIDENCE_BONUS = 0.10
+# Bump when similarity() or the match rule changes so cached pair decisions are dropped.
+DEDUP_MEMO_VERSION = 1
+EARTH_RADIUS_KM = 6371.0
+
+
+def parse_iso(value: str) -> Optional[dt.datetime]:
+    try:
+        return dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+
+class DisjointSet:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+        self.rank = [0] * size
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+
+    def groups(self) -> List[List[int]]:
+        buckets: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            buckets.setdefault(self.find(item), []).append(item)
+        return sorted(buckets.values(), key=lambda members: members[0])
+
+
+def spatial_cell(lat: float, lng: float) -> Tuple[int, int, int]:
+    # Grid over unit-sphere coordinates: chord length never exceeds arc length,
+    # so any pair within DEDUP_RADIUS_KM lands in the same or an adjacent cell.
+    step = DEDUP_RADIUS_KM / EARTH_RADIUS_KM
+    phi = math.radians(lat)
+    lam = math.radians(lng)
+    x = math.cos(phi) * math.cos(lam)
+    y = math.cos(phi) * math.sin(lam)
+    z = math.sin(phi)
+    return (math.floor(x / step), math.floor(y / step), math.floor(z / step))
+
+
+def is_nearby(a: Dict[str, Any], b: Dict[str, Any], t1: dt.datetime, t2: dt.datetime) -> bool:
+    if abs((t1 - t2).total_seconds()) > DEDUP_WINDOW_SECONDS:
+        return False
+    dist = haversine_km(
+        a["location"]["lat"],
+        a["location"]["lng"],
+        b["location"]["lat"],
+        b["location"]["lng"],
+    )
+    return dist <= DEDUP_RADIUS_KM
+
+
+def content_hash(inc: Dict[str, Any]) -> str:
+    location = inc.get("location", {})
+    seed = f"{inc.get('id')}|{inc.get('reported_at')}|{location.get('lat')}|{location.get('lng')}|{inc.get('description', '')}"
+    return sha1_id(seed)
+
+
+def candidate_pairs(incidents: List[Dict[str, Any]], times: List[Optional[dt.datetime]]) -> List[Tuple[int, int]]:
+    cells: Dict[Tuple[int, int, int], List[int]] = {}
+    for idx, inc in enumerate(incidents):
+        if times[idx] is None:
+            continue
+        cell = spatial_cell(inc["location"]["lat"], inc["location"]["lng"])
+        cells.setdefault(cell, []).append(idx)
+    offsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+    pairs = []
+    for cell, members in cells.items():
+        for dx, dy, dz in offsets:
+            neighbor = (cell[0] + dx, cell[1] + dy, cell[2] + dz)
+            # Visit each unordered cell pair once.
+            if neighbor < cell or neighbor not in cells:
                 continue
-            matched_idx = idx
-            break
-        if matched_idx is None:
-            merged.append(inc)
+            for i in members:
+                for j in cells[neighbor]:
+                    if neighbor == cell and j <= i:
+                        continue
+                    pairs.append((min(i, j), max(i, j)))
+    return sorted(pairs)
+
+
+def resolve_cluster(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Representative: highest confidence, earliest report, then lowest id.
+    rep = min(
+        members,
+        key=lambda inc: (-inc.get("confidence", 0.0), inc.get("reported_at", ""), inc.get("id", "")),
+    )
+    resolved = dict(rep)
+    if len(members) == 1:
+        return resolved
+    sources = {s.strip() for inc in members for s in inc.get("source", "").split(";") if s.strip()}
+    resolved["source"] = ";".join(sorted(sources))
+    longest = max(members, key=lambda inc: (len(inc.get("description", "")), inc is rep))
+    resolved["description"] = longest.get("description", "")
+    bonus = DEDUP_CONFIDENCE_BONUS * (len(members) - 1)
+    resolved["confidence"] = clamp(rep.get("confidence", 0.0) + bonus)
+    return resolved
+
+
+def read_dedup_memo(memo: Any) -> Tuple[Dict[str, bool], Dict[str, str]]:
+    # The memo is a cache: anything of the wrong shape is treated as empty.
+    if not isinstance(memo, dict):
+        return {}, {}
+    pairs = memo.get("pairs")
+    if not isinstance(pairs, dict) or memo.get("version") != DEDUP_MEMO_VERSION or memo.get("min_similarity") != DEDUP_MIN_SIMILARITY:
+        pairs = {}
+    clusters = memo.get("clusters")
+    if not isinstance(clusters, dict):
+        clusters = {}
+    known_pairs = {k: v for k, v in pairs.items() if isinstance(v, bool)}
+    known_clusters = {k: v for k, v in clusters.items() if isinstance(v, str) and v}
+    return known_pairs, known_clusters
+
+
+def mint_cluster_id(record_id: str) -> str:
+    return f"inc-{sha1_id(record_id)}"
+
+
+def cluster_incidents(incidents: List[Dict[str, Any]], known_pairs: Optional[Dict[str, bool]] = None) -> Tuple[List[List[Dict[str, Any]]], Dict[str, bool]]:
+    known_pairs = known_pairs or {}
+    incidents = sorted(incidents, key=lambda x: (x.get("reported_at", ""), x.get("id", "")))
+    times = [parse_iso(inc.get("reported_at", "")) for inc in incidents]
+    hashes = [content_hash(inc) for inc in incidents]
+    clusters = DisjointSet(len(incidents))
+    pairs: Dict[str, bool] = {}
+    for i, j in candidate_pairs(incidents, times):
+        if clusters.find(i) == clusters.find(j):
+            continue
+        if not is_nearby(incidents[i], incidents[j], times[i], times[j]):
             continue
-        base = merged[matched_idx]
-        sources = {s.strip() for s in (base.get("source", "").split(";") + inc.get("source", "").split(";")) if s.strip()}
-        base["source"] = ";".join(sorted(sources))
-        if len(inc.get("description", "")) > len(base.get("description", "")):
-            base["description"] = inc.get("description", "")
-        if inc.get("confidence", 0.0) > base.get("confidence", 0.0):
-            base["confidence"] = inc.get("confidence", 0.0)
-            base["location"] = inc.get("location", base.get("location"))
-            base["activity_type"] = inc.get("activity_type", base.get("activity_type"))
-            base["verification"] = inc.get("verification", base.get("verification"))
-            base["reported_at"] = inc.get("reported_at", base.get("reported_at"))
-        base["confidence"] = clamp(base.get("confidence", 0.0) + 0.10)
-        merged[matched_idx] = base
-    # Rebuild IDs to reflect merged sources
-    for inc in merged:
-        id_seed = f"{inc.get('source')}|{inc.get('reported_at')}|{inc.get('location', {}).get('lat')}|{inc.get('location', {}).get('lng')}|{inc.get('description', '')}"
-        inc["id"] = f"inc-{sha1_id(id_seed)}"
-    return merged
+        # Pair decisions are keyed on content, so an edited record is re-scored.
+        key = ":".join(sorted((hashes[i], hashes[j])))
+        match = known_pairs.get(key)
+        if match is None:
+            match = similarity(incidents[i].get("description", ""), incidents[j].get("description", "")) >= DEDUP_MIN_SIMILARITY
+        pairs[key] = match
+        if match:
+            clusters.union(i, j)
+    return [[incidents[idx] for idx in group] for group in clusters.groups()], pairs
+
+
+def deduplicate(incidents: List[Dict[str, Any]], memo: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    known_pairs, known_clusters = read_dedup_memo(memo)
+    groups, pairs = cluster_incidents(incidents, known_pairs)
+    # Records normally key the memo by ID, but fallback IDs (a hash of text and
+    # timestamp) can repeat across places, so repeated IDs add the content hash.
+    id_counts: Dict[str, int] = {}
+    for inc in incidents:
+        id_counts[inc.get("id", "")] = id_counts.get(inc.get("id", ""), 0) + 1
+    keys = [
+        [inc.get("id", "") if id_counts[inc.get("id", "")] == 1 else f"{inc.get('id', '')}|{content_hash(inc)}" for inc in members]
+        for members in groups
+    ]
+    # A minted ID belongs to the cluster holding the record it was minted from,
+    # so a split hands the ID back to that record rather than to whichever
+    # fragment is resolved first.
+    owners = {mint_cluster_id(key): pos for pos, member_keys in enumerate(keys) for key in member_keys}
+    merged = []
+    assigned: Dict[str, str] = {}
+    used_ids = set()
+    for pos, members in enumerate(groups):
+        resolved = resolve_cluster(members)
+        # Reuse the ID most members carried last run so clusters keep their ID
+        # as sources join; otherwise mint one from the earliest member.
+        previous: Dict[str, int] = {}
+        for key in keys[pos]:
+            prev_id = known_clusters.get(key)
+            if not prev_id or prev_id in used_ids or owners.get(prev_id, pos) != pos:
+                continue
+            previous[prev_id] = previous.get(prev_id, 0) + 1
+        if previous:
+            cluster_id = min(previous, key=lambda k: (-previous[k], k))
+        else:
+            minted = (mint_cluster_id(key) for key in keys[pos])
+            cluster_id = next((k for k in minted if k not in used_ids), "")
+            suffix = 1
+            while not cluster_id or cluster_id in used_ids:
+                cluster_id = mint_cluster_id(f"{keys[pos][0]}#{suffix}")
+                suffix += 1
+        used_ids.add(cluster_id)
+        resolved["id"] = cluster_id
+        for key in keys[pos]:
+            assigned[key] = cluster_id
+        merged.append(resolved)
+    return merged, {
+        "version": DEDUP_MEMO_VERSION,
+        "min_similarity": DEDUP_MIN_SIMILARITY,
+        "pairs": pairs,
+        "clusters": assigned,
+    }
 
 
 def group_by_date(incidents: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
@@ -647,7 +819,9 @@ def main() -> int:
 
     # Deduplicate and partition
     combined = normalized_stopice + normalized_ojonc
-    deduped = deduplicate(combined)
+    dedup_memo = read_json(DEDUP_MEMO_PATH, {})
+    deduped, dedup_memo = deduplicate(combined, dedup_memo)
+    write_json(DEDUP_MEMO_PATH, dedup_memo)
 
     # Write incidents by date
     by_date = group_by_date(deduped)
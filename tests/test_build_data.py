@@ -0,0 +1,232 @@
+import copy
+import datetime
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import build_data  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_fixture(name):
+    return json.loads((FIXTURES_DIR / name).read_text(encoding="utf-8"))
+
+
+def load_normalized():
+    # Snapshot of data/normalized/{stop_ice,local_networks}.json, which the build rewrites.
+    return load_fixture("normalized_incidents.json")
+
+
+def partition(incidents):
+    groups, _ = build_data.cluster_incidents(incidents)
+    return sorted(sorted(inc["id"] for inc in members) for members in groups)
+
+
+def is_match(a, b, t1, t2):
+    if not build_data.is_nearby(a, b, t1, t2):
+        return False
+    return build_data.similarity(a.get("description", ""), b.get("description", "")) >= build_data.DEDUP_MIN_SIMILARITY
+
+
+def test_partition_matches_baseline():
+    baseline = load_fixture("dedup_baseline_clusters.json")
+    incidents = load_normalized()
+    assert len(incidents) == 798
+    merged, _ = build_data.deduplicate(copy.deepcopy(incidents))
+    assert len(merged) == len(baseline) == 605
+    assert partition(incidents) == baseline
+
+
+def test_candidate_pairs_cover_all_matches():
+    incidents = sorted(load_normalized(), key=lambda x: (x["reported_at"], x["id"]))
+    times = [build_data.parse_iso(inc["reported_at"]) for inc in incidents]
+    all_pairs = {
+        (i, j)
+        for i, j in itertools.combinations(range(len(incidents)), 2)
+        if times[i] and times[j] and is_match(incidents[i], incidents[j], times[i], times[j])
+    }
+    grid_pairs = {
+        (i, j)
+        for i, j in build_data.candidate_pairs(incidents, times)
+        if is_match(incidents[i], incidents[j], times[i], times[j])
+    }
+    assert len(all_pairs) == 386
+    assert grid_pairs == all_pairs
+
+
+def test_deduplicate_ignores_input_order():
+    incidents = load_normalized()
+    expected, _ = build_data.deduplicate(copy.deepcopy(incidents))
+    rng = random.Random(0)
+    for _ in range(3):
+        shuffled = copy.deepcopy(incidents)
+        rng.shuffle(shuffled)
+        merged, _ = build_data.deduplicate(shuffled)
+        assert merged == expected
+
+
+def test_disjoint_set_groups():
+    clusters = build_data.DisjointSet(6)
+    clusters.union(0, 3)
+    clusters.union(4, 3)
+    clusters.union(1, 2)
+    clusters.union(2, 1)
+    assert clusters.find(0) == clusters.find(4)
+    assert clusters.find(0) != clusters.find(1)
+    assert clusters.groups() == [[0, 3, 4], [1, 2], [5]]
+
+
+def boundary_points(lat, lng):
+    # Walk east until the grid cell changes, returning points either side.
+    step = 0.0001
+    start = build_data.spatial_cell(lat, lng)
+    while build_data.spatial_cell(lat, lng + step) == start:
+        lng += step
+    return (lat, lng), (lat, lng + step)
+
+
+def make_incident(record_id, lat, lng, reported_at="2025-11-15T10:00:00+00:00"):
+    return {
+        "id": record_id,
+        "source": "stop_ice",
+        "reported_at": reported_at,
+        "location": {"city": "", "state": "", "lat": lat, "lng": lng},
+        "description": "masked agents near the grocery store parking lot",
+        "confidence": 0.5,
+    }
+
+
+def test_candidate_pairs_across_cell_boundary():
+    (lat1, lng1), (lat2, lng2) = boundary_points(35.2, -80.75)
+    assert build_data.spatial_cell(lat1, lng1) != build_data.spatial_cell(lat2, lng2)
+    far_lng = lng2 + 0.05
+    incidents = [
+        make_incident("a", lat1, lng1),
+        make_incident("b", lat2, lng2),
+        make_incident("c", lat2, far_lng),
+    ]
+    times = [build_data.parse_iso(inc["reported_at"]) for inc in incidents]
+    assert build_data.candidate_pairs(incidents, times) == [(0, 1)]
+    merged, _ = build_data.deduplicate(incidents)
+    assert len(merged) == 2
+
+
+def test_candidate_pairs_skip_unparseable_times():
+    incidents = [make_incident("a", 35.2, -80.75), make_incident("b", 35.2, -80.75, reported_at="not a date")]
+    times = [build_data.parse_iso(inc["reported_at"]) for inc in incidents]
+    assert build_data.candidate_pairs(incidents, times) == []
+
+
+def test_split_cluster_ids_stay_unique():
+    a = make_incident("a", 35.2, -80.75, reported_at="2025-11-15T10:00:00+00:00")
+    b = make_incident("b", 35.2, -80.75, reported_at="2025-11-15T10:30:00+00:00")
+    _, memo = build_data.deduplicate([copy.deepcopy(a), copy.deepcopy(b)])
+    original_id = build_data.mint_cluster_id("a")
+    assert memo["clusters"] == {"a": original_id, "b": original_id}
+
+    # a is edited so it no longer matches b, and an earlier record c joins b.
+    a["description"] = "checkpoint set up on the highway ramp"
+    c = make_incident("c", 35.2, -80.75, reported_at="2025-11-15T09:45:00+00:00")
+    merged, memo = build_data.deduplicate([a, b, c], memo)
+    ids = [inc["id"] for inc in merged]
+    assert len(ids) == len(set(ids)) == 2
+    assert memo["clusters"]["a"] == original_id
+    assert memo["clusters"]["b"] == memo["clusters"]["c"] == build_data.mint_cluster_id("c")
+
+
+def test_pair_memo_dropped_when_match_rule_changes(monkeypatch):
+    incidents = [make_incident("a", 35.2, -80.75), make_incident("b", 35.2, -80.75)]
+    _, memo = build_data.deduplicate(copy.deepcopy(incidents))
+    assert memo["version"] == build_data.DEDUP_MEMO_VERSION
+    assert list(memo["pairs"].values()) == [True]
+
+    monkeypatch.setattr(build_data, "DEDUP_MIN_SIMILARITY", 1.01)
+    merged, _ = build_data.deduplicate(copy.deepcopy(incidents), memo)
+    assert len(merged) == 2
+
+    monkeypatch.undo()
+    stale = {**memo, "version": build_data.DEDUP_MEMO_VERSION - 1, "pairs": {key: False for key in memo["pairs"]}}
+    merged, _ = build_data.deduplicate(copy.deepcopy(incidents), stale)
+    assert len(merged) == 1
+
+
+def test_malformed_memo_is_ignored():
+    incidents = [make_incident("a", 35.2, -80.75), make_incident("b", 35.2, -80.75)]
+    expected, _ = build_data.deduplicate(copy.deepcopy(incidents))
+    malformed = [
+        [],
+        "memo",
+        {"pairs": None, "clusters": None},
+        {"version": build_data.DEDUP_MEMO_VERSION, "min_similarity": build_data.DEDUP_MIN_SIMILARITY, "pairs": [], "clusters": []},
+        {"version": build_data.DEDUP_MEMO_VERSION, "min_similarity": build_data.DEDUP_MIN_SIMILARITY, "pairs": {"x:y": "yes"}, "clusters": {"a": 3}},
+    ]
+    for memo in malformed:
+        merged, _ = build_data.deduplicate(copy.deepcopy(incidents), memo)
+        assert merged == expected
+
+
+def test_cluster_id_stable_when_source_joins():
+    incidents = load_normalized()
+    merged, memo = build_data.deduplicate(copy.deepcopy(incidents))
+    target = next(inc for inc in merged if ";" not in inc["source"])
+    member = next(inc for inc in incidents if memo["clusters"][inc["id"]] == target["id"])
+    joining = {**copy.deepcopy(member), "id": "stopice-joining", "source": "stop_ice" if member["source"] != "stop_ice" else "ojonc"}
+    # Report the new source earlier so it becomes the cluster's earliest member.
+    joining["reported_at"] = (build_data.parse_iso(member["reported_at"]) - datetime.timedelta(minutes=30)).isoformat()
+
+    rerun, rememo = build_data.deduplicate(copy.deepcopy(incidents) + [joining], memo)
+    assert len(rerun) == len(merged)
+    assert rememo["clusters"]["stopice-joining"] == target["id"]
+    joined = next(inc for inc in rerun if inc["id"] == target["id"])
+    assert joined["source"] == "ojonc;stop_ice"
+    assert sorted(inc["id"] for inc in rerun) == sorted(inc["id"] for inc in merged)
+
+
+def test_second_run_skips_similarity(monkeypatch):
+    incidents = load_normalized()
+    merged, memo = build_data.deduplicate(copy.deepcopy(incidents))
+    memo = json.loads(json.dumps(memo))
+    calls = []
+    original = build_data.similarity
+
+    def counting_similarity(a, b):
+        calls.append((a, b))
+        return original(a, b)
+
+    monkeypatch.setattr(build_data, "similarity", counting_similarity)
+    rerun, rememo = build_data.deduplicate(copy.deepcopy(incidents), memo)
+    assert calls == []
+    assert rerun == merged
+    assert rememo == memo
+
+
+def test_repeated_record_ids_get_distinct_clusters():
+    first = make_incident("stopice-1", 35.0, -80.75)
+    second = {**make_incident("stopice-1", 36.0, -80.75), "description": "checkpoint set up on the highway ramp"}
+    twin = copy.deepcopy(first)
+    twin["reported_at"] = "not a date"
+    clone = copy.deepcopy(twin)
+    merged, memo = build_data.deduplicate([first, second, twin, clone])
+    ids = [inc["id"] for inc in merged]
+    assert len(ids) == len(set(ids)) == 4
+    assert len(memo["clusters"]) == 3
+
+    rerun, _ = build_data.deduplicate([first, second, twin, clone], memo)
+    assert sorted(inc["id"] for inc in rerun) == sorted(ids)
+
+
+def test_read_json_falls_back_on_unreadable_files(tmp_path):
+    assert build_data.read_json(tmp_path / "missing.json", {}) == {}
+    bad_bytes = tmp_path / "bad_bytes.json"
+    bad_bytes.write_bytes(b"\xff\xfe{")
+    assert build_data.read_json(bad_bytes, {}) == {}
+    truncated = tmp_path / "truncated.json"
+    truncated.write_text('{"pairs": ', encoding="utf-8")
+    assert build_data.read_json(truncated, {}) == {}
+    assert build_data.read_json(tmp_path, {}) == {}